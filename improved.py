@@ -1,8 +1,12 @@
 import csv
+import io
+import locale
+import mmap
 import os
-import re
+import sys
 import logging
-from datetime import datetime, timedelta
+import operator
+from functools import lru_cache
 
 # Configure logging
 logging.basicConfig(
@@ -10,80 +14,276 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s: %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
 )
+logger = logging.getLogger(__name__)
 
-def parse_time_input(time_input):
-    """Normalize and parse time input with multiple formats."""
-    time_input = re.sub(r'[\.;]', ':', time_input)
-    time_input = re.sub(r'[,]', '.', time_input)
-    time_input = time_input.strip()
+# Translation table for time input normalization
+_TIME_TRANS = str.maketrans({'.': ':', ';': ':', ',': '.'})
+
+# Column order of the sessions CSV
+HEADERS = ('start_time', 'end_time', 'original_hours', 'original_minutes',
+           'rounded_hours', 'rounded_minutes', 'decimal_hours', 'formatted_cost', 'cost')
+
+# Reads a session's fields as a tuple in HEADERS order
+_session_row = operator.attrgetter(*HEADERS)
+
+# Row template for the session table
+_ROW_FMT = "{:<5} {:<10} {:<10} {:<15} {:<15} {:<15} {:<10}\n"
+
+# 64 KB write buffer for streamed CSV output
+_WRITE_BUFFER_SIZE = 1 << 16
+
+# Billing rates
+_HOURLY_RATE = 220
+_HALF_HOUR_RATE = 110
+
+# Rounding lookup: leftover minutes -> (hour delta, rounded minutes)
+_ROUND = tuple((0, 0) if m <= 19 else (0, 30) if m <= 49 else (1, 0) for m in range(60))
+# Cost of whole rounded hours (a session never exceeds 24 hours)
+_COST = tuple(h * _HOURLY_RATE for h in range(25))
+
+# Batch sizes at which NumPy, and then Numba's import and compile time, pay off
+_BULK_MIN_SESSIONS = 1_000
+_NUMBA_MIN_SESSIONS = 10_000
+
+class Session:
+    """A single calculated session, one per CSV row."""
+    __slots__ = HEADERS
+
+    def __init__(self, start_time, end_time, original_hours, original_minutes,
+                 rounded_hours, rounded_minutes, decimal_hours, formatted_cost, cost):
+        self.start_time = start_time
+        self.end_time = end_time
+        self.original_hours = original_hours
+        self.original_minutes = original_minutes
+        self.rounded_hours = rounded_hours
+        self.rounded_minutes = rounded_minutes
+        self.decimal_hours = decimal_hours
+        self.formatted_cost = formatted_cost
+        self.cost = cost
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"Session({fields})"
+
+@lru_cache(maxsize=1024)
+def _parse_time_cached(time_input):
+    """Normalize and parse time input.
+
+    Returns (minutes since midnight or None when invalid, normalized text).
+    """
+    time_input = time_input.translate(_TIME_TRANS).strip()
 
     # Convert input like '2000' to '20:00'
-    if len(time_input) == 4 and time_input.isdigit():
+    if (len(time_input) == 4
+            and '0' <= time_input[0] <= '9' and '0' <= time_input[1] <= '9'
+            and '0' <= time_input[2] <= '9' and '0' <= time_input[3] <= '9'):
         time_input = f"{time_input[:2]}:{time_input[2:]}"
     
     try:
-        return datetime.strptime(time_input, "%H:%M")
+        # Known H:M shape, so split and int() instead of strptime
+        hour_part, sep, minute_part = time_input.partition(':')
+        if (not sep
+                or not 1 <= len(hour_part) <= 2 or not 1 <= len(minute_part) <= 2
+                or not (hour_part + minute_part).isascii()
+                or not (hour_part + minute_part).isdigit()):
+            raise ValueError
+        hour = int(hour_part)
+        minute = int(minute_part)
+        if hour > 23 or minute > 59:
+            raise ValueError
+        return hour * 60 + minute, time_input
     except ValueError:
-        logging.error(f"Invalid time format: {time_input}. Please use HH:MM, HH.MM, HH;MM, or HHMM format.")
-        return None
+        return None, time_input
 
-def calculate_duration(start_time, end_time):
-    """Calculate duration with advanced rounding and cost calculation."""
-    duration = end_time - start_time
-    if duration.total_seconds() < 0:
-        logging.error("End time must be after start time.")
+def parse_time_input(time_input):
+    """Normalize and parse time input with multiple formats into minutes since midnight."""
+    parsed, normalized = _parse_time_cached(time_input)
+    if parsed is None:
+        logger.error("Invalid time format: %s. Please use HH:MM, HH.MM, HH;MM, or HHMM format.", normalized)
+    return parsed
+
+def calculate_duration(start_min, end_min):
+    """Calculate duration with advanced rounding and cost calculation.
+
+    Times are minutes since midnight; overnight sessions have end_min
+    already shifted past 1440.
+    """
+    total_minutes = end_min - start_min
+    if total_minutes < 0:
+        logger.error("End time must be after start time.")
         return None
 
-    total_minutes = duration.total_seconds() / 60
-    hours = total_minutes // 60
-    minutes = total_minutes % 60
+    hours, minutes = divmod(total_minutes, 60)
 
     # Rounding logic
-    if minutes <= 19:
-        rounded_hours = int(hours)
-        rounded_minutes = 0
-    elif 20 <= minutes <= 49:
-        rounded_hours = int(hours)
-        rounded_minutes = 30
-    else:
-        rounded_hours = int(hours) + 1
-        rounded_minutes = 0
+    hour_delta, rounded_minutes = _ROUND[minutes]
+    rounded_hours = hours + hour_delta
 
     # Decimal hours based on ROUNDED time
     decimal_hours = rounded_hours + (0.5 if rounded_minutes == 30 else 0)
 
     # Cost calculation
-    cost = (rounded_hours * 220) + (rounded_minutes // 30 * 110)
-
-    logging.info(f"Duration calculated: {hours}h {minutes}m | Rounded: {rounded_hours}h {rounded_minutes}m")
-
-    return {
-        "start_time": start_time.strftime("%H:%M"),
-        "end_time": end_time.strftime("%H:%M"),
-        "original_hours": int(hours),
-        "original_minutes": int(minutes),
-        "rounded_hours": rounded_hours,
-        "rounded_minutes": rounded_minutes,
-        "decimal_hours": round(decimal_hours, 1),
-        "cost": cost,
-        "formatted_cost": f"${cost:.2f}"
-    }
+    cost = _COST[rounded_hours] + (rounded_minutes // 30 * _HALF_HOUR_RATE)
+
+    logger.info("Duration calculated: %sh %sm | Rounded: %sh %sm", hours, minutes, rounded_hours, rounded_minutes)
+
+    # Back to clock times only for the result
+    start_hour, start_minute = divmod(start_min % 1440, 60)
+    end_hour, end_minute = divmod(end_min % 1440, 60)
+
+    return Session(
+        start_time=f"{start_hour:02d}:{start_minute:02d}",
+        end_time=f"{end_hour:02d}:{end_minute:02d}",
+        original_hours=hours,
+        original_minutes=minutes,
+        rounded_hours=rounded_hours,
+        rounded_minutes=rounded_minutes,
+        decimal_hours=round(decimal_hours, 1),
+        cost=float(cost),
+        formatted_cost=f"${cost:.2f}"
+    )
+
+@lru_cache(maxsize=None)
+def _round_arrays():
+    """_ROUND as a pair of NumPy arrays indexed by leftover minutes."""
+    import numpy as np
+    hour_delta, rounded_minutes = zip(*_ROUND)
+    return np.array(hour_delta, dtype=np.int64), np.array(rounded_minutes, dtype=np.int64)
+
+def calculate_durations_bulk(starts_min, ends_min):
+    """Vectorized rounding and cost calculation for many sessions at once.
+
+    Takes arrays of start/end times as minutes since midnight (ends already
+    shifted past 1440 for overnight sessions) and returns arrays of
+    rounded_hours, rounded_minutes, decimal_hours and cost.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("NumPy is required for bulk duration calculation.") from None
+
+    total_minutes = np.asarray(ends_min, dtype=np.int64) - np.asarray(starts_min, dtype=np.int64)
+    hours, minutes = np.divmod(total_minutes, 60)
+
+    # Same rounding table as calculate_duration
+    hour_delta, round_minutes = _round_arrays()
+    rounded_hours = hours + hour_delta[minutes]
+    rounded_minutes = round_minutes[minutes]
+    decimal_hours = rounded_hours + (rounded_minutes == 30) * 0.5
+    cost = rounded_hours * _HOURLY_RATE + (rounded_minutes == 30) * _HALF_HOUR_RATE
+
+    return rounded_hours, rounded_minutes, decimal_hours, cost
+
+@lru_cache(maxsize=None)
+def _numba_round_cost():
+    """Build the Numba rounding/cost kernel on first use, or return None without Numba."""
+    try:
+        import numpy as np
+        from numba import njit, prange
+    except ImportError:
+        return None
+
+    @njit(parallel=True, cache=True)
+    def round_cost(total_minutes, hour_delta, round_minutes, hourly_rate, half_hour_rate):
+        n = total_minutes.shape[0]
+        rounded_hours = np.empty(n, np.int64)
+        rounded_minutes = np.empty(n, np.int64)
+        cost = np.empty(n, np.int64)
+        for i in prange(n):
+            minutes = total_minutes[i] % 60
+            rounded_hours[i] = total_minutes[i] // 60 + hour_delta[minutes]
+            rounded_minutes[i] = round_minutes[minutes]
+            cost[i] = rounded_hours[i] * hourly_rate + (rounded_minutes[i] == 30) * half_hour_rate
+        return rounded_hours, rounded_minutes, cost
+
+    return round_cost
+
+def _recompute_bulk(times):
+    """Recalculate (start_min, end_min) pairs with NumPy, and Numba for large batches."""
+    import numpy as np
+
+    starts, ends = np.array(times, dtype=np.int64).reshape(-1, 2).T
+    total_minutes = ends - starts
+    round_cost = _numba_round_cost() if len(times) >= _NUMBA_MIN_SESSIONS else None
+    if round_cost is not None:
+        rounded_hours, rounded_minutes, cost = round_cost(
+            total_minutes, *_round_arrays(), _HOURLY_RATE, _HALF_HOUR_RATE)
+    else:
+        rounded_hours, rounded_minutes, _, cost = calculate_durations_bulk(starts, ends)
+
+    # Back to per-session objects with native Python values
+    hours, minutes = np.divmod(total_minutes, 60)
+    return [
+        Session(
+            start_time=f"{start_min // 60:02d}:{start_min % 60:02d}",
+            end_time=f"{end_min // 60 % 24:02d}:{end_min % 60:02d}",
+            original_hours=h,
+            original_minutes=m,
+            rounded_hours=rh,
+            rounded_minutes=rm,
+            decimal_hours=rh + 0.5 if rm == 30 else rh,
+            cost=float(c),
+            formatted_cost=f"${c:.2f}"
+        )
+        for (start_min, end_min), h, m, rh, rm, c in zip(
+            times, hours.tolist(), minutes.tolist(), rounded_hours.tolist(),
+            rounded_minutes.tolist(), cost.tolist())
+    ]
+
+def recompute_all(sessions):
+    """Recalculate every session from its start/end times in one batch.
+
+    Small batches go through calculate_duration; larger ones use NumPy
+    (and Numba, when installed, for very large ones). Sessions whose
+    times do not parse are returned unchanged.
+    """
+    recomputed = list(sessions)
+    indices = []
+    times = []
+    for i, session in enumerate(sessions):
+        start_min = parse_time_input(session.start_time)
+        end_min = parse_time_input(session.end_time)
+        if start_min is None or end_min is None:
+            logger.error("Keeping unparsable session %s - %s as loaded", session.start_time, session.end_time)
+            continue
+
+        # Handle overnight sessions
+        if end_min < start_min:
+            end_min += 1440
+        indices.append(i)
+        times.append((start_min, end_min))
+
+    new_sessions = None
+    if len(times) >= _BULK_MIN_SESSIONS:
+        try:
+            new_sessions = _recompute_bulk(times)
+        except ImportError:
+            pass
+    if new_sessions is None:
+        new_sessions = [calculate_duration(start_min, end_min) for start_min, end_min in times]
+
+    for i, session in zip(indices, new_sessions):
+        recomputed[i] = session
+    return recomputed
 
 def display_sessions(sessions):
     """Display sessions in a formatted, readable manner."""
-    print("\n{:<5} {:<10} {:<10} {:<15} {:<15} {:<15} {:<10}".format(
-        "No.", "Start", "End", "Original Time", "Rounded Time", "Decimal Hours", "Cost"))
-    print("-" * 85)
+    lines = [
+        "\n",
+        _ROW_FMT.format("No.", "Start", "End", "Original Time", "Rounded Time", "Decimal Hours", "Cost"),
+        "-" * 85 + "\n",
+    ]
     for i, session in enumerate(sessions, 1):
-        print("{:<5} {:<10} {:<10} {:<15} {:<15} {:<15} {:<10}".format(
-            str(i)+".", 
-            session['start_time'], 
-            session['end_time'], 
-            f"{session['original_hours']}h {session['original_minutes']}m",
-            f"{session['rounded_hours']}h {session['rounded_minutes']}m",
-            session['decimal_hours'],
-            session['formatted_cost']
+        lines.append(_ROW_FMT.format(
+            f"{i}.",
+            session.start_time,
+            session.end_time,
+            f"{session.original_hours}h {session.original_minutes}m",
+            f"{session.rounded_hours}h {session.rounded_minutes}m",
+            session.decimal_hours,
+            session.formatted_cost
         ))
+    sys.stdout.write("".join(lines))
 
 def get_multiple_session_details():
     """Interactive method to get multiple session details."""
@@ -95,20 +295,20 @@ def get_multiple_session_details():
 
         end_input = input("Enter end time: ")
 
-        start_time = parse_time_input(start_input)
-        end_time = parse_time_input(end_input)
+        start_min = parse_time_input(start_input)
+        end_min = parse_time_input(end_input)
 
-        if not start_time or not end_time:
+        if start_min is None or end_min is None:
             continue
 
         # Handle overnight sessions
-        if end_time < start_time:
-            end_time += timedelta(days=1)
+        if end_min < start_min:
+            end_min += 1440
 
-        duration = calculate_duration(start_time, end_time)
+        duration = calculate_duration(start_min, end_min)
         if duration:
             sessions.append(duration)
-            print(f"Session added: {duration['start_time']} - {duration['end_time']}, Cost: {duration['formatted_cost']}")
+            print(f"Session added: {duration.start_time} - {duration.end_time}, Cost: {duration.formatted_cost}")
 
     return sessions
 
@@ -129,7 +329,7 @@ def manage_sessions(sessions):
             new_sessions = get_multiple_session_details()
             if new_sessions:
                 sessions.extend(new_sessions)
-                logging.info(f"Added {len(new_sessions)} new session(s).")
+                logger.info("Added %s new session(s).", len(new_sessions))
 
         elif choice == '2':
             # Edit Session
@@ -144,18 +344,18 @@ def manage_sessions(sessions):
                     start_input = input("Enter new start time: ")
                     end_input = input("Enter new end time: ")
 
-                    start_time = parse_time_input(start_input)
-                    end_time = parse_time_input(end_input)
+                    start_min = parse_time_input(start_input)
+                    end_min = parse_time_input(end_input)
 
-                    if start_time and end_time:
+                    if start_min is not None and end_min is not None:
                         # Handle overnight sessions
-                        if end_time < start_time:
-                            end_time += timedelta(days=1)
+                        if end_min < start_min:
+                            end_min += 1440
 
-                        new_session = calculate_duration(start_time, end_time)
+                        new_session = calculate_duration(start_min, end_min)
                         if new_session:
                             sessions[index] = new_session
-                            logging.info("Session updated successfully.")
+                            logger.info("Session updated successfully.")
                 else:
                     print("Invalid session number.")
             except ValueError:
@@ -171,11 +371,10 @@ def manage_sessions(sessions):
                 indices = input("Enter session numbers to remove (comma-separated): ")
                 to_remove = [int(x.strip()) - 1 for x in indices.split(',')]
                 
-                # Remove in reverse to maintain index integrity
-                for index in sorted(to_remove, reverse=True):
-                    if 0 <= index < len(sessions):
-                        del sessions[index]
-                        logging.info(f"Removed session {index + 1}")
+                # Rebuild the list once instead of deleting one index at a time
+                to_remove_set = {i for i in to_remove if 0 <= i < len(sessions)}
+                sessions[:] = [session for j, session in enumerate(sessions) if j not in to_remove_set]
+                logger.info("Removed %s session(s)", len(to_remove_set))
             except ValueError:
                 print("Invalid input. Please enter valid session numbers.")
 
@@ -187,25 +386,133 @@ def manage_sessions(sessions):
 def save_sessions_to_csv(sessions, filename):
     """Save sessions to a CSV file with comprehensive error handling."""
     try:
+        # Format the whole file in memory, then write it in one call
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(HEADERS)
+        writer.writerows(map(_session_row, sessions))
         with open(filename, 'w', newline='') as file:
-            # Include 'cost' in the fieldnames list
-            fieldnames = ['start_time', 'end_time', 'original_hours', 'original_minutes', 
-                          'rounded_hours', 'rounded_minutes', 'decimal_hours', 'formatted_cost', 'cost']
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            # Ensure all fields are written properly
-            for session in sessions:
-                session_copy = session.copy()  # To prevent mutation
-                session_copy['cost'] = float(session_copy.get('cost', 0))  # Convert to float
-                writer.writerow(session_copy)
+            file.write(buffer.getvalue())
         
-        # Convert cost values to floats before summing
-        total_cost = sum(float(session.get('cost', 0)) for session in sessions)
-        logging.info(f"Sessions saved to {filename}")
+        total_cost = sum(session.cost for session in sessions)
+        logger.info("Sessions saved to %s", filename)
         print(f"Total Cost: ${total_cost:.2f}")
     except Exception as e:
-        logging.error(f"Error saving sessions: {e}")
+        logger.error("Error saving sessions: %s", e)
+
+def _int_or_float(value):
+    """Parse '2' as an int and '1.5' as a float, as calculate_duration produces them."""
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+def _optional_field(row, name, convert, default=0):
+    """Convert a numeric CSV field, falling back to default only when it is missing or blank.
+
+    Unparsable values raise ValueError so a damaged file is never silently zeroed.
+    """
+    value = row.get(name)
+    if value is None or not value.strip():
+        return default
+    return convert(value)
+
+def _coerce_row(row):
+    """Build a Session from a CSV row, converting numeric fields to native types.
+
+    Only start_time and end_time are required; older files without the
+    other columns still load with zero defaults.
+    """
+    if not row.get('start_time') or not row.get('end_time'):
+        raise ValueError(f"Session row without start_time/end_time: {row}")
+
+    cost = _optional_field(row, 'cost', float, 0.0)
+    return Session(
+        start_time=row['start_time'],
+        end_time=row['end_time'],
+        original_hours=_optional_field(row, 'original_hours', int),
+        original_minutes=_optional_field(row, 'original_minutes', int),
+        rounded_hours=_optional_field(row, 'rounded_hours', int),
+        rounded_minutes=_optional_field(row, 'rounded_minutes', int),
+        decimal_hours=_optional_field(row, 'decimal_hours', _int_or_float),
+        formatted_cost=row.get('formatted_cost') or f"${cost:.2f}",
+        cost=cost
+    )
+
+def iter_sessions_from_csv(filename):
+    """Yield sessions from a CSV file one row at a time."""
+    with open(filename, 'r', newline='') as file:
+        for row in csv.DictReader(file):
+            yield _coerce_row(row)
+
+def fast_load_csv(path):
+    """Yield sessions from a CSV file by splitting lines of a memory-mapped view of it.
+
+    Files written by save_sessions_to_csv never quote values, so plain
+    splitting is enough; files containing quotes go through
+    iter_sessions_from_csv instead.
+    """
+    if os.path.getsize(path) == 0:
+        return
+    # Same encoding open() uses for the writer and the csv fallback
+    encoding = locale.getpreferredencoding(False)
+
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm.find(b'"') == -1:
+            header = [name.strip() for name in mm.readline().decode(encoding).rstrip('\r\n').split(',')]
+            for line in iter(mm.readline, b''):
+                line = line.rstrip(b'\r\n')
+                if not line:
+                    continue
+                yield _coerce_row(dict(zip(header, line.decode(encoding).split(','))))
+            return
+
+    yield from iter_sessions_from_csv(path)
+
+def process_csv_streaming(in_path, out_path):
+    """Recalculate every session in a CSV file without loading it all into memory."""
+    if os.path.exists(out_path) and os.path.samefile(in_path, out_path):
+        logger.error("Refusing to overwrite the input file %s", in_path)
+        return
+
+    with open(in_path, 'r', newline='') as infile:
+        reader = csv.reader(infile)
+
+        header = next(reader, None)
+        if header is None:
+            logger.error("No sessions found in %s", in_path)
+            return
+        if 'start_time' not in header or 'end_time' not in header:
+            logger.error("%s is missing the start_time/end_time columns", in_path)
+            return
+        start_idx = header.index('start_time')
+        end_idx = header.index('end_time')
+
+        with open(out_path, 'w', newline='', buffering=_WRITE_BUFFER_SIZE) as outfile:
+            writer = csv.writer(outfile)
+            writer.writerow(HEADERS)
+
+            for line_num, row in enumerate(reader, 2):
+                if not row:
+                    continue
+                if len(row) <= max(start_idx, end_idx):
+                    logger.error("Skipping incomplete session on line %s", line_num)
+                    continue
+
+                start_min = parse_time_input(row[start_idx])
+                end_min = parse_time_input(row[end_idx])
+                if start_min is None or end_min is None:
+                    logger.error("Skipping invalid session on line %s", line_num)
+                    continue
+
+                # Handle overnight sessions
+                if end_min < start_min:
+                    end_min += 1440
+
+                session = calculate_duration(start_min, end_min)
+                writer.writerow(_session_row(session))
+
+    logger.info("Processed sessions from %s into %s", in_path, out_path)
 
 def main():
     print("Time Tracking and Billing System")
@@ -216,12 +523,13 @@ def main():
     # Load existing sessions if file exists
     if os.path.exists(filename):
         try:
-            with open(filename, 'r') as file:
-                reader = csv.DictReader(file)
-                sessions = list(reader)
-                logging.info(f"Loaded {len(sessions)} existing sessions.")
+            sessions = recompute_all(list(fast_load_csv(filename)))
+            logger.info("Loaded %s existing sessions.", len(sessions))
         except Exception as e:
-            logging.error(f"Error loading existing sessions: {e}")
+            # Saving now would overwrite the file with whatever loaded before the error
+            logger.error("Error loading existing sessions: %s", e)
+            logger.error("Leaving %s untouched.", filename)
+            return
 
     # Manage sessions
     final_sessions = manage_sessions(sessions)